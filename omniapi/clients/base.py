@@ -5,7 +5,7 @@ import time
 from abc import ABC, abstractmethod
 from itertools import cycle
 from pathlib import Path
-from typing import Optional, Union, Sequence, Any, Dict, Callable, Coroutine
+from typing import Optional, Union, Sequence, Any, Dict, List, Callable, Coroutine
 from urllib.parse import urlparse, urlunparse
 
 import aiohttp
@@ -43,19 +43,28 @@ class BaseClient(ABC):
         file_name_mode (FileNameStrategy, optional): Strategy for naming files. Defaults to FileNameStrategy.URL_HASH_MD5.
         error_strategy (str, optional): Strategy for error handling. Defaults to 'log'.
         display_progress_bar (bool, optional): Whether to display a progress bar. Defaults to False.
+        checksum_strategy (str, optional): When downloaded files are hashed. Either 'streaming' to hash the data
+            while it is downloaded, or 'post_hoc' to hash the file once it is written. Defaults to 'post_hoc'.
+        checksum_algorithm (str, optional): Hash algorithm for the checksums of downloaded files. Either 'md5',
+            'sha256', or 'blake3' (requires the blake3 package). Defaults to 'md5'.
+        fsync_on_download (bool, optional): Whether downloaded files are flushed to disk with fsync before
+            they are reported as downloaded. Defaults to False.
         auth (Optional[BasicAuth], optional): Basic auth credentials. Defaults to None.
         connector (Optional[BaseConnector], optional): Connector to use. Defaults to None.
         cookie_jar (Optional[AbstractCookieJar], optional): Cookie jar to use. Defaults to None.
         cookies (Optional[dict], optional): Cookies to use. Defaults to None.
         headers (Optional[dict], optional): Headers to use. Defaults to None.
         trust_env (bool, optional): Whether to trust environment variables for things like proxies. Defaults to False.
+        max_workers (int, optional): Number of worker tasks that send the requests of each configured endpoint,
+            which bounds the number of requests in flight per endpoint. Each endpoint has its own workers, so a
+            throttled endpoint does not hold up the others. Defaults to 100, the connection limit of aiohttp's
+            default connector.
     """
 
     logger = logging.getLogger(__name__)
     logger.setLevel(logging.INFO)
 
     clients = []
-    stats = ClientStats()
 
     def __init__(self,
                  max_requests_per_interval: Union[Sequence[numeric], numeric] = 5,
@@ -68,13 +77,19 @@ class BaseClient(ABC):
                  files_download_directory: PathType = None,
                  file_name_mode: FileNameStrategy = FileNameStrategy.URL_HASH_MD5,
                  error_strategy: str = 'log',
-                 display_progress_bar: bool = False, *,
+                 display_progress_bar: bool = False,
+                 checksum_strategy: str = 'post_hoc',
+                 checksum_algorithm: str = 'md5',
+                 fsync_on_download: bool = False, *,
                  auth: Optional[BasicAuth] = None,
                  connector: Optional[BaseConnector] = None,
                  cookie_jar: Optional[AbstractCookieJar] = None,
                  cookies: Optional[dict] = None,
                  headers: Optional[dict] = None,
-                 trust_env: bool = False):
+                 trust_env: bool = False,
+                 max_workers: int = 100):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1!")
         if files_download_directory is not None:
             files_download_directory = Path(files_download_directory)
             files_download_directory.mkdir(exist_ok=True, parents=True)
@@ -90,6 +105,9 @@ class BaseClient(ABC):
             error_strategy=error_strategy,
             files_download_directory=files_download_directory,
             file_name_mode=file_name_mode,
+            checksum_strategy=checksum_strategy,
+            checksum_algorithm=checksum_algorithm,
+            fsync_on_download=fsync_on_download,
         )
 
         session_config = SessionConfig(
@@ -109,9 +127,16 @@ class BaseClient(ABC):
         self.endpoint_configs[None] = api_config
 
         self.display_progress_bar = display_progress_bar
+        self.max_workers = max_workers
 
         self.visited = set()
-        self.tasks = []
+        # Request queues of the endpoints, each consumed by its own `max_workers` workers
+        self.request_queues: Dict[Optional[str], asyncio.Queue] = dict()
+        self._request_workers: List[asyncio.Task] = []
+        self._unfinished_requests = 0
+        self._requests_done: Optional[asyncio.Future] = None
+        self._progress_bar: Optional[tqdm] = None
+        self.stats = ClientStats()
 
     @classmethod
     def from_config(cls, api_config: APIConfig, session_config: SessionConfig = SessionConfig()):
@@ -185,21 +210,31 @@ class BaseClient(ABC):
                 **session_config.to_dict(),
             )
             self.clients.append(client)
-        else:
-            client = self.get_state(api_config.base_url).client
+            return ClientState(
+                client=client,
+                api_keys_queue=api_keys_queue,
+                semaphores=semaphores,
+                last_request_time=last_request_time,
+                wait_time=wait_time,
+            )
 
+        # endpoints that share a session also share its download buffers
+        session_state = self.get_state(api_config.base_url)
         return ClientState(
-            client=client,
+            client=session_state.client,
             api_keys_queue=api_keys_queue,
             semaphores=semaphores,
             last_request_time=last_request_time,
             wait_time=wait_time,
+            write_buffers=session_state.write_buffers,
+            hash_buffers=session_state.hash_buffers,
         )
 
     def add_settings(self, url: str, *, max_requests_per_interval=None,
                      interval_unit=None, max_concurrent_requests=None, api_keys=None, allow_redirects=None,
                      max_redirects=None, timeout=None, files_download_directory=None,
-                     file_name_mode=None, error_strategy=None, display_progress_bar=None,
+                     file_name_mode=None, error_strategy=None, display_progress_bar=None, checksum_strategy=None,
+                     checksum_algorithm=None, fsync_on_download=None,
                      auth=None, connector=None, cookie_jar=None, cookies=None, headers=None, trust_env=None,
                      api_config: Optional[APIConfig] = None, session_config: Optional[SessionConfig] = None):
         """
@@ -241,6 +276,12 @@ class BaseClient(ABC):
             api_config.error_strategy = error_strategy
         if display_progress_bar is not None:
             api_config.display_progress_bar = display_progress_bar
+        if checksum_strategy is not None:
+            api_config.checksum_strategy = checksum_strategy
+        if checksum_algorithm is not None:
+            api_config.checksum_algorithm = checksum_algorithm
+        if fsync_on_download is not None:
+            api_config.fsync_on_download = fsync_on_download
 
         self.endpoint_configs[base_url] = api_config
 
@@ -353,10 +394,12 @@ class BaseClient(ABC):
         Returns:
            ClientState: The state of the endpoint.
         """
-        if (base_url := urlparse(url).netloc) in self.endpoint_states:
-            return self.endpoint_states[base_url]
-        else:
-            return self.endpoint_states[None]
+        return self.endpoint_states[self._get_endpoint(url)]
+
+    def _get_endpoint(self, url: str) -> Optional[str]:
+        """Returns the base URL the endpoint is configured under, or None for the global endpoint."""
+        base_url = urlparse(url).netloc
+        return base_url if base_url in self.endpoint_states else None
 
     def get_config(self, url: Optional[str] = None) -> APIConfig:
         """
@@ -410,22 +453,29 @@ class BaseClient(ABC):
             async with state.client.request(
                     method, url, headers=headers, **request_params, timeout=config.timeout, **kwargs) as response:
                 self.stats.add_response(response)
-                response_result = Response(response, config, state, self.logger)
-                async for result in self.request_callback(response_result, setup_info):
-                    if result is None:
-                        continue
-                    response_type, content = result
-                    if response_type != ResponseType.REQUEST:
-                        continue
-                    new_method, new_url, new_data, new_settings = content
-                    new_parsed_url = urlparse(new_url)
-                    if len(new_parsed_url.netloc) == 0:
-                        # noinspection PyProtectedMember
-                        new_parsed_url = new_parsed_url._replace(scheme=parsed_url.scheme, netloc=parsed_url.netloc)
-                        new_url = urlunparse(new_parsed_url)
-                    new_requests.append((new_method, new_url, new_data, new_settings))
+                response_result = Response.acquire(response, config, state, self.logger)
+                callback = self.request_callback(response_result, setup_info)
+                try:
+                    async for result in callback:
+                        if result is None:
+                            continue
+                        response_type, content = result
+                        if response_type != ResponseType.REQUEST:
+                            continue
+                        new_method, new_url, new_data, new_settings = content
+                        new_parsed_url = urlparse(new_url)
+                        if len(new_parsed_url.netloc) == 0:
+                            # noinspection PyProtectedMember
+                            new_parsed_url = new_parsed_url._replace(scheme=parsed_url.scheme,
+                                                                     netloc=parsed_url.netloc)
+                            new_url = urlunparse(new_parsed_url)
+                        new_requests.append((new_method, new_url, new_data, new_settings))
+                finally:
+                    # the callback must be done with the response before it goes back to the free list
+                    await callback.aclose()
+                    response_result.release()
         except asyncio.TimeoutError as e:
-            self.stats.timeouts += 1
+            self.stats.add_timeout()
             self.logger.error(
                 {"message": "request_failed", "method": method, "url": url, "data": data, "error": str(e)})
         except aiohttp.ClientResponseError as e:
@@ -438,8 +488,8 @@ class BaseClient(ABC):
         finally:
             await self.make_request_cleanup(url, setup_info)
             for new_method, new_url, new_data, new_settings in new_requests:
-                for method, url, data, kwargs in self._package_requests(new_method, new_url, new_data, new_settings):
-                    self.tasks.append(asyncio.create_task(self._get_request_handler(method)(url, data, kwargs)))
+                for request in self._package_requests(new_method, new_url, new_data, new_settings):
+                    self._queue_request(request)
 
     async def _get(self, url: str, params: dict = None, kwargs: dict = None):
         """
@@ -515,6 +565,46 @@ class BaseClient(ABC):
         for _ in range(max_length):
             yield next(methods), next(endpoints), next(data_list), next(settings)
 
+    def _queue_request(self, request: tuple):
+        """
+        Adds a request to the queue of its endpoint, starting the workers of the endpoint on its first request.
+
+        Args:
+            request (tuple): The method, URL, data and settings of the request.
+        """
+        endpoint = self._get_endpoint(request[1])
+        request_queue = self.request_queues.get(endpoint)
+        if request_queue is None:
+            request_queue = self.request_queues[endpoint] = asyncio.Queue()
+            self._request_workers.extend(asyncio.create_task(self._request_worker(request_queue))
+                                         for _ in range(self.max_workers))
+        request_queue.put_nowait(request)
+        self._unfinished_requests += 1
+
+    async def _request_worker(self, request_queue: asyncio.Queue):
+        """
+        Sends the requests in the request queue of an endpoint one at a time until it is cancelled.
+        If a request raises an exception, the exception is passed on to `execute_requests` and the worker stops.
+
+        Args:
+            request_queue (asyncio.Queue): The request queue of the endpoint.
+        """
+        while True:
+            method, url, data, kwargs = await request_queue.get()
+            try:
+                await self._get_request_handler(method)(url, data, kwargs)
+            except Exception as e:
+                if not self._requests_done.done():
+                    self._requests_done.set_exception(e)
+                return
+            finally:
+                request_queue.task_done()
+                if self._progress_bar is not None:
+                    self._progress_bar.update(1)
+                self._unfinished_requests -= 1
+                if self._unfinished_requests == 0 and not self._requests_done.done():
+                    self._requests_done.set_result(None)
+
     async def execute_requests(self,
                                methods: StringSequence,
                                urls: StringSequence,
@@ -522,6 +612,8 @@ class BaseClient(ABC):
                                settings: OptionalDictSequence):
         """
         Executes the requests. Displays a progress bar if `self.display_progress_bar` is set to True.
+        The requests, including the ones chained from responses, are queued by endpoint, and the queue
+        of each endpoint is consumed by `self.max_workers` workers of its own.
 
         Args:
             methods (StringSequence): The HTTP methods for the requests.
@@ -529,21 +621,23 @@ class BaseClient(ABC):
             data_list (OptionalDictSequence): The data for the requests.
             settings (OptionalDictSequence): The settings for the requests.
         """
-
-        tasks = [asyncio.create_task(self._get_request_handler(method)(endpoint, data, s))
-                 for method, endpoint, data, s in self._package_requests(methods, urls, data_list, settings)]
-        if self.display_progress_bar:
-            pbar = tqdm()
-            while tasks:
-                for task in asyncio.as_completed(tasks):
-                    await task
-                    pbar.update(1)
-                tasks, self.tasks = self.tasks, []
-            pbar.close()
-        else:
-            while tasks:
-                await asyncio.gather(*tasks)
-                tasks, self.tasks = self.tasks, []
+        self.request_queues = dict()
+        self._request_workers = []
+        self._unfinished_requests = 0
+        self._requests_done = asyncio.get_running_loop().create_future()
+        self._progress_bar = tqdm() if self.display_progress_bar else None
+        try:
+            for request in self._package_requests(methods, urls, data_list, settings):
+                self._queue_request(request)
+            if self._unfinished_requests:
+                await self._requests_done
+        finally:
+            for worker in self._request_workers:
+                worker.cancel()
+            await asyncio.gather(*self._request_workers, return_exceptions=True)
+            if self._progress_bar is not None:
+                self._progress_bar.close()
+                self._progress_bar = None
 
     async def run(self,
                   methods: StringSequence,
@@ -11,7 +11,7 @@ class JsonFileClient(APIClient):
     Class to download API content and store the results in a JSON file.
     The JSON file is organized into 3 sections: json, text, and file.
     The `json` and `text` sections store responses with JSON and TEXT type.
-    The `file` section stores the url, file path, and checksum of the files downloaded.
+    The `file` section stores the url, file path, checksum, and checksum algorithm of the files downloaded.
 
     Attributes:
         export_results_path (str): The path where the results will be exported as a JSON file.
@@ -31,9 +31,14 @@ class JsonFileClient(APIClient):
         """
         super().__init__(*args, **kwargs)
         self.export_results_path = export_results_path
-        self.results = {ResponseType.JSON.name.lower(): [],
-                        ResponseType.TEXT.name.lower(): [],
-                        ResponseType.FILE.name.lower(): []}
+        self._json = []
+        self._text = []
+        self._file = []
+
+    @property
+    def results(self) -> dict:
+        """The results, organized into the `json`, `text`, and `file` sections."""
+        return {'json': self._json, 'text': self._text, 'file': self._file}
 
     async def process_request(self, response_type: ResponseType, content):
         """
@@ -45,13 +50,16 @@ class JsonFileClient(APIClient):
             content (Any): Content of the response
 
         Returns:
-            Tuple[ResultType, Any]: The result type and content.
+            Tuple[ResponseType, Any]: The result type and content.
 
         """
 
-        if response_type in [ResponseType.JSON, ResponseType.TEXT, ResponseType.FILE]:
-            key = response_type.name.lower()
-            self.results[key].append(content)
+        if response_type is ResponseType.JSON:
+            self._json.append(content)
+        elif response_type is ResponseType.TEXT:
+            self._text.append(content)
+        elif response_type is ResponseType.FILE:
+            self._file.append(content)
         yield response_type, content
 
     async def export_results(self):
@@ -60,10 +68,12 @@ class JsonFileClient(APIClient):
         """
 
         export_path = Path(self.export_results_path)
-        if export_path.exists():
-            self.logger.error(f"File {export_path} already exists! Overwriting file...")
         export_path.parent.mkdir(exist_ok=True, parents=True)
-        await write_json(export_path, self.results)
+        try:
+            await write_json(export_path, self.results, overwrite=False)
+        except FileExistsError:
+            self.logger.error(f"File {export_path} already exists! Overwriting file...")
+            await write_json(export_path, self.results)
 
     async def run(self,
                   methods: StringSequence,
@@ -1,7 +1,8 @@
 import datetime
 from abc import ABCMeta
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 from enum import Enum, auto
+from functools import lru_cache
 from typing import Optional, Sequence, Union
 from urllib.parse import urlparse
 
@@ -13,13 +14,32 @@ from omniapi.utils.types import PathType
 from omniapi.utils.types import numeric
 
 
+@lru_cache(maxsize=256)
+def _netloc_of(url: str) -> str:
+    """Returns the network location of the url. Results are cached as the same base urls are parsed repeatedly."""
+    return urlparse(url).netloc
+
+
+@lru_cache(maxsize=None)
+def _field_names(cls) -> tuple:
+    """Returns the names of the fields of a dataclass. Results are cached per class."""
+    return tuple(f.name for f in fields(cls))
+
+
 class FileNameStrategy(Enum):
-    """Enum for different file naming strategies."""
+    """
+    Enum for different file naming strategies.
+
+    The URL_HASH strategies hash the UTF-8 encoded URL as it is, without decoding percent-escapes,
+    so 'a%20b' and 'a b' get different names. Earlier versions decoded the escapes before hashing,
+    so URLs containing them are named differently than before.
+    """
 
     UNIQUE_ID = auto()
     FILE_NAME = auto()
     URL_HASH_MD5 = auto()
     URL_HASH_SHA1 = auto()
+    URL_HASH_XXH3 = auto()  # Requires the xxhash package. Non-cryptographic, but faster than MD5 and SHA1
 
 
 @dataclass
@@ -30,8 +50,11 @@ class BaseConfig(metaclass=ABCMeta):
     """
 
     def to_dict(self):
-        """Convert the dataclass to a dictionary."""
-        return asdict(self)
+        """
+        Convert the dataclass to a dictionary. The values are not copied, so that objects such as
+        connectors and cookie jars are passed on as they are.
+        """
+        return {name: getattr(self, name) for name in _field_names(type(self))}
 
 
 @dataclass
@@ -46,7 +69,7 @@ class APIConfig(BaseConfig):
     @base_url.setter
     def base_url(self, _base_url: Optional[str] = None):
         if _base_url is not None:
-            self._base_url = urlparse(_base_url).netloc
+            self._base_url = _netloc_of(_base_url)
 
     # Request Rate
     max_requests_per_interval: Union[Sequence[numeric], numeric] = 0
@@ -64,6 +87,9 @@ class APIConfig(BaseConfig):
     # Export Results Path
     files_download_directory: PathType = None
     file_name_mode: FileNameStrategy = FileNameStrategy.URL_HASH_MD5
+    checksum_strategy: str = 'post_hoc'  # 'streaming' hashes while downloading, 'post_hoc' hashes the written file
+    checksum_algorithm: str = 'md5'  # 'md5', 'sha256', or 'blake3'
+    fsync_on_download: bool = False  # flush downloaded files to disk before returning them
 
     # User Settings
     display_progress_bar: bool = False
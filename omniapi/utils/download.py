@@ -1,20 +1,152 @@
 """Helper functions for downloading content"""
 
+import asyncio
 import hashlib
+import itertools
 import logging
 import mimetypes
 import os
+import queue
+import threading
 import uuid
+from collections import deque
+from functools import lru_cache
 from pathlib import Path
-from typing import Union, Optional
-from urllib.parse import unquote_to_bytes, urlparse
+from typing import Callable, List, Optional, Union
 
-import aiofiles
 from aiohttp.client_reqrep import ClientResponse
 from yarl import URL
 
 from omniapi.utils.config import APIConfig, FileNameStrategy
 from omniapi.utils.exception import raise_exception
+from omniapi.utils.headers import media_type
+from omniapi.utils.state import ClientState
+
+try:
+    import blake3
+except ImportError:  # blake3 is an optional dependency, only needed for the 'blake3' checksum algorithm
+    blake3 = None
+
+try:
+    import xxhash
+except ImportError:  # xxhash is an optional dependency, only needed for FileNameStrategy.URL_HASH_XXH3
+    xxhash = None
+
+_HASH_CONSTRUCTORS = {
+    'md5': hashlib.md5,
+    'sha256': hashlib.sha256,
+}
+if blake3 is not None:
+    _HASH_CONSTRUCTORS['blake3'] = blake3.blake3
+
+# Extensions of the Content-Types commonly returned by APIs, consulted before falling back to mimetypes
+_CONTENT_TYPE_EXTENSIONS = {
+    'application/json': '.json',
+    'application/ld+json': '.jsonld',
+    'application/geo+json': '.geojson',
+    'application/xml': '.xml',
+    'application/atom+xml': '.atom',
+    'application/rss+xml': '.rss',
+    'application/yaml': '.yaml',
+    'application/octet-stream': '.bin',
+    'application/pdf': '.pdf',
+    'application/rtf': '.rtf',
+    'application/epub+zip': '.epub',
+    'application/zip': '.zip',
+    'application/gzip': '.gz',
+    'application/x-gzip': '.gz',
+    'application/x-tar': '.tar',
+    'application/x-bzip2': '.bz2',
+    'application/x-7z-compressed': '.7z',
+    'application/javascript': '.js',
+    'application/wasm': '.wasm',
+    'application/sql': '.sql',
+    'application/x-sh': '.sh',
+    'application/msword': '.doc',
+    'application/vnd.ms-excel': '.xls',
+    'application/vnd.ms-powerpoint': '.ppt',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document': '.docx',
+    'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet': '.xlsx',
+    'application/vnd.openxmlformats-officedocument.presentationml.presentation': '.pptx',
+    'text/plain': '.txt',
+    'text/html': '.html',
+    'text/css': '.css',
+    'text/csv': '.csv',
+    'text/xml': '.xml',
+    'text/javascript': '.js',
+    'text/markdown': '.md',
+    'text/calendar': '.ics',
+    'text/tab-separated-values': '.tsv',
+    'image/png': '.png',
+    'image/jpeg': '.jpg',
+    'image/gif': '.gif',
+    'image/webp': '.webp',
+    'image/svg+xml': '.svg',
+    'image/bmp': '.bmp',
+    'image/tiff': '.tiff',
+    'image/avif': '.avif',
+    'image/x-icon': '.ico',
+    'image/vnd.microsoft.icon': '.ico',
+    'audio/mpeg': '.mp3',
+    'audio/wav': '.wav',
+    'audio/x-wav': '.wav',
+    'audio/ogg': '.oga',
+    'audio/aac': '.aac',
+    'audio/flac': '.flac',
+    'audio/mp4': '.m4a',
+    'video/mp4': '.mp4',
+    'video/mpeg': '.mpeg',
+    'video/webm': '.webm',
+    'video/ogg': '.ogv',
+    'video/quicktime': '.mov',
+    'video/x-msvideo': '.avi',
+    'font/woff': '.woff',
+    'font/woff2': '.woff2',
+    'font/ttf': '.ttf',
+    'font/otf': '.otf',
+}
+
+
+@lru_cache(maxsize=256)
+def _guess_extension(content_type: str) -> Optional[str]:
+    """
+    Guesses the extension of a Content-Type header from its media type, ignoring parameters such as the charset.
+    Falls back to mimetypes if the media type is not in the extension table. Results are cached, as the
+    mimetypes lookup is slow and a client sees few distinct Content-Type headers.
+    """
+    content_media_type = media_type(content_type)
+    return _CONTENT_TYPE_EXTENSIONS.get(content_media_type) or mimetypes.guess_extension(content_media_type)
+
+
+def _url_bytes(url: Union[str, URL]) -> bytes:
+    """Encodes the URL to hash it. Percent-escapes are hashed as they are, without decoding them first."""
+    return str(url).encode('utf-8', 'surrogatepass')
+
+
+def _md5_name(url: Union[str, URL]) -> str:
+    """Names the file with the MD5 hash of its URL."""
+    return hashlib.md5(_url_bytes(url)).hexdigest()
+
+
+def _sha1_name(url: Union[str, URL]) -> str:
+    """Names the file with the SHA1 hash of its URL."""
+    return hashlib.sha1(_url_bytes(url)).hexdigest()
+
+
+def _xxh3_name(url: Union[str, URL]) -> str:
+    """Names the file with the 128-bit XXH3 hash of its URL."""
+    if xxhash is None:
+        raise ValueError("The xxhash package must be installed to use FileNameStrategy.URL_HASH_XXH3!")
+    return xxhash.xxh3_128_hexdigest(_url_bytes(url))
+
+
+_FILE_NAMERS = {
+    FileNameStrategy.UNIQUE_ID: lambda url: uuid.uuid4().hex,
+    FileNameStrategy.URL_HASH_MD5: _md5_name,
+    FileNameStrategy.URL_HASH_SHA1: _sha1_name,
+    FileNameStrategy.URL_HASH_XXH3: _xxh3_name,
+    FileNameStrategy.FILE_NAME: lambda url: os.path.basename(str(url)),
+}
 
 
 def get_file_name(url: Union[str, URL], strategy: FileNameStrategy):
@@ -27,38 +159,362 @@ def get_file_name(url: Union[str, URL], strategy: FileNameStrategy):
 
     Returns:
         The name for the file.
+
+    Raises:
+        ValueError: If the strategy is not a supported FileNameStrategy.
     """
-    url = str(url)
-    if strategy == FileNameStrategy.UNIQUE_ID:
-        return str(uuid.uuid4())
-    elif strategy == FileNameStrategy.URL_HASH_MD5:
-        return hashlib.md5(unquote_to_bytes(url)).hexdigest()
-    elif strategy == FileNameStrategy.URL_HASH_SHA1:
-        return hashlib.sha1(unquote_to_bytes(url)).hexdigest()
-    elif strategy == FileNameStrategy.FILE_NAME:
-        return os.path.basename(url)
+    try:
+        namer = _FILE_NAMERS[strategy]
+    except KeyError:
+        raise ValueError(f"File naming strategy {strategy} is not supported!") from None
+    return namer(url)
+
+
+# Maximum number of free buffers kept in a buffer pool, buffers released beyond it are dropped
+_MAX_BUFFER_POOL_SIZE = 16
+
+
+def _acquire_buffer(buffer_pool: Optional[deque], size: int) -> bytearray:
+    """Takes a free buffer from the pool, or allocates a new one of `size` bytes if the pool is empty."""
+    if buffer_pool:
+        return buffer_pool.pop()
+    return bytearray(size)
+
+
+def _release_buffer(buffer_pool: Optional[deque], buffer: bytearray):
+    """Returns a buffer to the pool, or drops it if the pool is full so that idle buffers are not kept forever."""
+    if buffer_pool is not None and len(buffer_pool) < _MAX_BUFFER_POOL_SIZE:
+        buffer_pool.append(buffer)
+
+
+# Queues of the shared writer threads. Each file is written by one of them, so that concurrent downloads
+# do not each start a thread
+_MAX_WRITER_THREADS = 4
+_writer_queues: List[queue.SimpleQueue] = []
+_writer_threads_lock = threading.Lock()
+_next_writer = itertools.count()
+
+
+def _run_writer_thread(write_queue: queue.SimpleQueue):
+    """Processes the writes queued for the files assigned to a writer thread, forever."""
+    while True:
+        file_writer, data = write_queue.get()
+        try:
+            file_writer._process(data)
+        except Exception as e:  # the thread is shared, so a failure must only fail the file it was writing
+            file_writer._fail(data, e)
+
+
+def _reset_writer_threads():
+    """Forgets the writer threads in a forked child, which inherits their queues but not the threads."""
+    global _writer_threads_lock
+    _writer_queues.clear()
+    _writer_threads_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):  # not available on Windows, which does not fork
+    os.register_at_fork(after_in_child=_reset_writer_threads)
+
+
+def _get_writer_queue() -> queue.SimpleQueue:
+    """Returns the queue of the next writer thread, starting the writer threads on first use."""
+    if not _writer_queues:
+        with _writer_threads_lock:
+            while len(_writer_queues) < _MAX_WRITER_THREADS:
+                write_queue = queue.SimpleQueue()
+                threading.Thread(target=_run_writer_thread, args=(write_queue,),
+                                 name='omniapi-file-writer', daemon=True).start()
+                _writer_queues.append(write_queue)
+    return _writer_queues[next(_next_writer) % _MAX_WRITER_THREADS]
+
+
+class _FileWriter:
+    """
+    Writes data to a file from one of a few shared background threads. The event loop only copies the data
+    into a preallocated buffer and queues it in blocks of up to `buffer_size` bytes, instead of dispatching
+    every write to the default executor. The file is also synced and closed on that thread, so waiting for
+    the disk never blocks the event loop. At most `max_pending` blocks are queued at a time, after which
+    `write` waits for the disk to catch up.
+
+    Args:
+        filename (Union[Path, str]): The name of the file to write to.
+        overwrite (bool, optional): Whether an existing file should be overwritten. Default is True.
+        buffer_size (int, optional): The size of the write buffer. Default is 1 MiB.
+        buffer_pool (Optional[deque]): Free buffers of `buffer_size` bytes to take the write buffers from.
+            The buffers are returned to it once they are written.
+        fsync (bool, optional): Whether to flush the file to disk with fsync before closing it. Default is False.
+        max_pending (int, optional): The number of blocks that can be queued before `write` waits. Default is 4.
+
+    Raises:
+        FileExistsError: If `overwrite` is False and the file already exists.
+    """
+
+    def __init__(self,
+                 filename: Union[Path, str],
+                 overwrite: bool = True,
+                 buffer_size: int = 1024 * 1024,
+                 buffer_pool: Optional[deque] = None,
+                 fsync: bool = False,
+                 max_pending: int = 4):
+        flags = os.O_WRONLY | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+        flags |= os.O_TRUNC if overwrite else os.O_EXCL
+        self._fd = os.open(filename, flags, 0o644)
+        self._buffer_size = buffer_size
+        self._buffer_pool = buffer_pool
+        self._fsync = fsync
+        self._view = memoryview(_acquire_buffer(buffer_pool, buffer_size))
+        self._length = 0
+        self._pending = asyncio.Semaphore(max_pending)
+        self._queue = _get_writer_queue()
+        self._error: Optional[Exception] = None
+        self._loop = asyncio.get_running_loop()
+        self._closed = self._loop.create_future()
+
+    async def write(self, data: bytes):
+        """Copies data into the write buffer, and queues the buffer once it is full."""
+        size = len(data)
+        if self._length + size > self._buffer_size:
+            await self._flush()
+        if size >= self._buffer_size:
+            await self._pending.acquire()
+            self._queue.put_nowait((self, data))
+            return
+        self._view[self._length:self._length + size] = data
+        self._length += size
+        if self._length == self._buffer_size:
+            await self._flush()
+
+    async def _flush(self):
+        """Queues the buffered data and starts a new buffer."""
+        if self._length:
+            await self._pending.acquire()
+            self._queue.put_nowait((self, self._view[:self._length]))
+            # the queued buffer now belongs to the writer thread
+            self._view = memoryview(_acquire_buffer(self._buffer_pool, self._buffer_size))
+            self._length = 0
+
+    def _notify(self, callback: Callable, *args):
+        """Schedules a callback on the event loop of the writer from the writer thread."""
+        try:
+            self._loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:  # the event loop is closed, nobody is waiting anymore
+            pass
+
+    def _process(self, data):
+        """Writes a queued block, or syncs and closes the file for the None sentinel. Runs on a writer thread."""
+        if data is None:
+            if self._fsync and self._error is None:
+                try:
+                    os.fsync(self._fd)
+                except OSError as e:
+                    self._error = e
+            try:
+                os.close(self._fd)
+            except OSError as e:
+                if self._error is None:
+                    self._error = e
+            self._notify(self._set_closed)
+            return
+        if self._error is None:  # after an error, the remaining blocks are only released
+            try:
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(self._fd, view):]
+            except OSError as e:
+                self._error = e
+        if isinstance(data, memoryview):
+            _release_buffer(self._buffer_pool, data.obj)
+        self._notify(self._pending.release)
+
+    def _fail(self, data, error: Exception):
+        """Records an unexpected error of the writer thread and wakes up the coroutine waiting for `data`."""
+        if self._error is None:
+            self._error = error
+        if data is None:
+            self._notify(self._set_closed)
+        else:
+            self._notify(self._pending.release)
+
+    def _set_closed(self):
+        """Resolves the future awaited by `close`, unless `close` was cancelled."""
+        if not self._closed.done():
+            self._closed.set_result(None)
+
+    async def close(self):
+        """
+        Waits for the queued data to be written and closes the file.
+
+        Raises:
+            OSError: If writing, syncing or closing the file failed.
+        """
+        # the last block is queued without waiting, so that the file is closed even if this is cancelled
+        if self._length:
+            self._queue.put_nowait((self, self._view[:self._length]))
+        else:
+            _release_buffer(self._buffer_pool, self._view.obj)
+        self._queue.put_nowait((self, None))
+        await self._closed
+        if self._error is not None:
+            raise self._error
+
+
+class _BufferedHasher:
+    """
+    Hashes data in a background task, on a worker thread, in blocks of up to `block_size` bytes.
+    The downloader only queues the chunks, so reading the response and writing the file are not held up
+    by hashing. hashlib releases the GIL when hashing large blocks, so hashing does not block the event loop
+    or other downloads either.
+
+    Small chunks are copied into a single buffer, which is hashed through a memoryview
+    and reused once the hash is updated.
+
+    Args:
+        hash_obj: The hash object to update.
+        block_size (int, optional): The size of the hash buffer. Default is 64 KiB.
+        max_pending (int, optional): The number of chunks that can be queued before `update` waits. Default is 4.
+        buffer_pool (Optional[deque]): Free buffers of `block_size` bytes to take the hash buffer from.
+            The buffer is returned to it once hashing stops.
+    """
+
+    def __init__(self,
+                 hash_obj,
+                 block_size: int = 64 * 1024,
+                 max_pending: int = 4,
+                 buffer_pool: Optional[deque] = None):
+        self._hash_obj = hash_obj
+        self._block_size = block_size
+        self._buffer_pool = buffer_pool
+        self._view = memoryview(_acquire_buffer(buffer_pool, block_size))
+        self._length = 0
+        self._queue = asyncio.Queue(maxsize=max_pending)
+        self._task = asyncio.create_task(self._run())
+
+    async def update(self, data: bytes):
+        """Queues data to be hashed. Waits if the hasher is too far behind."""
+        await self._queue.put(data)
+
+    async def _run(self):
+        """Hashes the queued data until the sentinel is received."""
+        try:
+            while (data := await self._queue.get()) is not None:
+                size = len(data)
+                if self._length + size > self._block_size:
+                    await asyncio.to_thread(self._hash_obj.update, self._view[:self._length])
+                    self._length = 0
+                if size >= self._block_size:
+                    await asyncio.to_thread(self._hash_obj.update, data)
+                    continue
+                self._view[self._length:self._length + size] = data
+                self._length += size
+            if self._length:
+                self._hash_obj.update(self._view[:self._length])
+        finally:
+            _release_buffer(self._buffer_pool, self._view.obj)
+
+    async def hexdigest(self) -> str:
+        """Waits for the queued data to be hashed and returns the digest."""
+        await self._queue.put(None)
+        await self._task
+        return self._hash_obj.hexdigest()
+
+    def cancel(self):
+        """Stops hashing. Does nothing if the digest was already computed."""
+        self._task.cancel()
+
+
+def _get_hash_constructor(algorithm: str) -> Callable:
+    """
+    Returns the constructor of the hash object for a checksum algorithm.
+
+    Args:
+        algorithm (str): The checksum algorithm. Can be either 'md5', 'sha256', or 'blake3'.
+
+    Returns:
+        Callable: A function that creates a new hash object.
+
+    Raises:
+        ValueError: If the algorithm is not supported or its package is not installed.
+    """
+    if algorithm not in _HASH_CONSTRUCTORS:
+        if algorithm == 'blake3':
+            raise ValueError("The blake3 package must be installed to use the 'blake3' checksum algorithm!")
+        raise ValueError("Checksum algorithm must be either 'md5', 'sha256', or 'blake3'!")
+    return _HASH_CONSTRUCTORS[algorithm]
+
+
+def _file_checksum(filename: Union[Path, str], hash_constructor: Callable) -> str:
+    """
+    Computes the hash of a file on disk.
+
+    Args:
+        filename (Union[Path, str]): The name of the file to hash.
+        hash_constructor (Callable): Function that creates the hash object.
+
+    Returns:
+        The hash of the file.
+    """
+    with open(filename, 'rb', buffering=0) as f:
+        if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+            return hashlib.file_digest(f, hash_constructor).hexdigest()
+        hash_obj = hash_constructor()
+        while chunk := f.read(256 * 1024):
+            hash_obj.update(chunk)
+        return hash_obj.hexdigest()
 
 
 async def download_file(response: ClientResponse,
                         filename: Union[Path, str],
-                        chunk_size: int = 1024):
+                        *,
+                        overwrite: bool = True,
+                        checksum_strategy: str = 'post_hoc',
+                        checksum_algorithm: str = 'md5',
+                        state: Optional[ClientState] = None,
+                        fsync: bool = False):
     """
     Downloads a file given by a ClientResponse object and writes it to a file named `filename`.
 
     Args:
        response (ClientResponse): The ClientResponse object with the file to download.
        filename (Union[Path, str]): The name for the downloaded file.
-       chunk_size (int, optional): The size of chunks to write to the file. Default is 1024.
+       overwrite (bool, optional): Whether an existing file should be overwritten. Default is True.
+       checksum_strategy (str, optional): Either 'streaming' to hash the chunks as they are downloaded,
+            or 'post_hoc' to hash the file after it is written, which reads it back from the page cache
+            outside the event loop. Default is 'post_hoc'.
+       checksum_algorithm (str, optional): The hash algorithm of the checksum. Can be either 'md5', 'sha256',
+            or 'blake3' if the blake3 package is installed. Default is 'md5'.
+       state (Optional[ClientState]): State of the API Client. If provided, the write and hash buffers
+            are taken from its buffer pools and returned to them afterwards.
+       fsync (bool, optional): Whether to flush the file to disk with fsync before returning. Default is False.
 
     Returns:
-       The MD5 hash of the downloaded file.
+       The hash of the downloaded file.
+
+    Raises:
+        FileExistsError: If `overwrite` is False and the file already exists.
+        ValueError: If the checksum strategy or algorithm is not supported.
     """
-    hash_obj = hashlib.md5()
-    async with aiofiles.open(filename, 'wb') as out_file:
-        async for chunk in response.content.iter_chunked(chunk_size):
-            await out_file.write(chunk)
-            hash_obj.update(chunk)
-    return hash_obj.hexdigest()
+    if checksum_strategy not in {'streaming', 'post_hoc'}:
+        raise ValueError("Checksum strategy must be either 'streaming' or 'post_hoc'!")
+    hash_constructor = _get_hash_constructor(checksum_algorithm)
+    write_buffers = state.write_buffers if state is not None else None
+    hash_buffers = state.hash_buffers if state is not None else None
+    writer = _FileWriter(filename, overwrite, buffer_pool=write_buffers, fsync=fsync)
+    hasher = None
+    if checksum_strategy == 'streaming':
+        hasher = _BufferedHasher(hash_constructor(), buffer_pool=hash_buffers)
+    try:
+        # read the data as it arrives, instead of slicing it into fixed-size chunks
+        while chunk := await response.content.readany():
+            await writer.write(chunk)
+            if hasher is not None:
+                await hasher.update(chunk)
+        if hasher is not None:
+            return await hasher.hexdigest()
+    finally:
+        if hasher is not None:
+            hasher.cancel()
+        await writer.close()
+    return await asyncio.to_thread(_file_checksum, filename, hash_constructor)
 
 
 def get_file_extension(response: ClientResponse,
@@ -78,7 +534,7 @@ def get_file_extension(response: ClientResponse,
 
     if 'Content-Type' in response.headers:
         content_type = response.headers['Content-Type']
-        extension = mimetypes.guess_extension(content_type)
+        extension = _guess_extension(content_type)
         if extension:
             return extension
         else:
@@ -88,46 +544,50 @@ def get_file_extension(response: ClientResponse,
                 exception_type='warning',
                 logger=logger
             )
-    path = urlparse(response.url.path).path
-    extension = Path(path).suffix
-    if extension:
-        return extension
+    path = response.url.path
+    dot = path.rfind('.')
+    # a leading dot starts a hidden file name, and a trailing dot has no extension after it
+    if path.rfind('/') + 1 < dot < len(path) - 1:
+        return path[dot:]
     return None
 
 
 def get_file_path(response: ClientResponse,
                   config: APIConfig,
-                  logger: Optional[logging.Logger] = None) -> Path:
+                  logger: Optional[logging.Logger] = None,
+                  state: Optional[ClientState] = None) -> str:
     """
     Gets the download path of the file from the response. Creates the parent directories if they do not exist.
+    The path is built with os.path string operations, as it is computed for every download.
 
     Args:
         response (ClientResponse): Response of download request.
         config (APIConfig): Configuration of API Client.
         logger (Optional[logging.Logger]): Logger for logging.
+        state (Optional[ClientState]): State of the API Client. If provided, the directories it already
+            created are not created again.
 
     Returns:
-        Path: Path object representing the download location of the file.
+        str: The download location of the file.
     """
 
-    download_directory = Path(config.files_download_directory)
-    download_directory.mkdir(exist_ok=True, parents=True)
-    file_name = Path(get_file_name(response.url, config.file_name_mode))
+    download_directory = os.fspath(config.files_download_directory)
+    if state is None or download_directory not in state.known_directories:
+        os.makedirs(download_directory, exist_ok=True)
+        if state is not None:
+            state.known_directories.add(download_directory)
+    file_name = get_file_name(response.url, config.file_name_mode)
     file_extension = get_file_extension(response, config.error_strategy, logger)
-    file_path = file_name.with_suffix(file_extension)
-    file_path = download_directory / file_path
-    if file_path.exists():
-        raise_exception(f"Overwriting existing file {file_path}",
-                        error_strategy=config.error_strategy,
-                        exception_type='warning',
-                        logger=logger)
-    return file_path
+    if file_extension:
+        file_name = os.path.splitext(file_name)[0] + file_extension
+    return os.path.join(download_directory, file_name)
 
 
 async def download_file_to_path(response: ClientResponse,
                                 config: APIConfig,
                                 download_dir: Optional[Union[str, Path]] = None,
-                                logger: Optional[logging.Logger] = None):
+                                logger: Optional[logging.Logger] = None,
+                                state: Optional[ClientState] = None):
     """
     Downloads a file to a specified path.
 
@@ -136,20 +596,37 @@ async def download_file_to_path(response: ClientResponse,
         config (APIConfig): The configuration object for the API.
         download_dir (Optional[Union[str, Path]]): The directory to download the file to. Defaults to None.
         logger (Optional[logging.Logger]): The logger to use. Defaults to None.
+        state (Optional[ClientState]): The state of the API Client. Defaults to None.
 
     Returns:
-        dict: A dictionary containing information about the download including the url, path, and checksum.
+        dict: A dictionary containing information about the download including the url, path, checksum,
+            and the algorithm of the checksum. The path is a string relative to the files download directory.
     """
     if config.files_download_directory is None:
         return None
-    base_dir = Path(config.files_download_directory)
-    file_path = get_file_path(response, config, logger)
+    file_path = get_file_path(response, config, logger, state)
+    relative_path = os.path.basename(file_path)  # files are saved directly in the files download directory
     if download_dir is not None:
-        file_path = Path(download_dir) / file_path
-    checksum = await download_file(response, file_path)
-    file_path = file_path.relative_to(base_dir)
+        file_path = os.path.join(download_dir, file_path)
+    try:
+        checksum = await download_file(response, file_path, overwrite=False,
+                                       checksum_strategy=config.checksum_strategy,
+                                       checksum_algorithm=config.checksum_algorithm,
+                                       state=state,
+                                       fsync=config.fsync_on_download)
+    except FileExistsError:
+        raise_exception(f"Overwriting existing file {file_path}",
+                        error_strategy=config.error_strategy,
+                        exception_type='warning',
+                        logger=logger)
+        checksum = await download_file(response, file_path,
+                                       checksum_strategy=config.checksum_strategy,
+                                       checksum_algorithm=config.checksum_algorithm,
+                                       state=state,
+                                       fsync=config.fsync_on_download)
     return {
         "url": str(response.url),
-        "path": file_path,
+        "path": relative_path,
         "checksum": checksum,
+        "checksum_algorithm": config.checksum_algorithm,
     }
@@ -2,6 +2,44 @@ import logging
 
 from typing import Optional
 
+_EXCEPTION_TYPES = {'error': RuntimeError, 'warning': RuntimeWarning}
+
+
+def _get_exception_class(exception_type: str) -> type:
+    """Returns the exception class of an exception type."""
+    if exception_type not in _EXCEPTION_TYPES:
+        raise RuntimeError("Exception type must be either 'error' or 'warning'!")
+    return _EXCEPTION_TYPES[exception_type]
+
+
+def _ignore_exception(message: str, exception_type: str, logger: Optional[logging.Logger]):
+    """Ignores the exception."""
+    return False
+
+
+def _log_exception(message: str, exception_type: str, logger: Optional[logging.Logger]):
+    """Logs the exception as an error or a warning, depending on its type."""
+    _get_exception_class(exception_type)
+    if logger is None:
+        raise RuntimeError("Logger must be provided if logging exception")
+    if exception_type == 'error':
+        logger.error(message)
+    else:
+        logger.warning(message)
+
+
+def _raise_exception(message: str, exception_type: str, logger: Optional[logging.Logger]):
+    """Raises the exception as a RuntimeError or a RuntimeWarning, depending on its type."""
+    raise _get_exception_class(exception_type)(message)
+
+
+# Handlers of the error handling strategies, looked up once per call instead of branching on the strategy
+_STRATEGY_HANDLERS = {
+    'ignore': _ignore_exception,
+    'log': _log_exception,
+    'raise': _raise_exception,
+}
+
 
 def raise_exception(message: str,
                     error_strategy: str,
@@ -15,20 +53,7 @@ def raise_exception(message: str,
         exception_type (str): Type of exception. Can be either 'error' or 'warning'
         logger (logging.Logger, optional): Logger of API Client
     """
-    if error_strategy not in {'raise', 'log', 'ignore'}:
+    handler = _STRATEGY_HANDLERS.get(error_strategy)
+    if handler is None:
         raise RuntimeError("Error Handling Strategy in settings must be either 'raise', 'log', or 'ignore'!")
-    if error_strategy == 'ignore':
-        return False
-    if exception_type not in {'error', 'warning'}:
-        raise RuntimeError("Exception type must be either 'error' or 'warning'!")
-    if error_strategy == 'log':
-        if logger is None:
-            raise RuntimeError("Logger must not be provided if logging exception")
-        if exception_type == 'error':
-            logger.error(message)
-        else:
-            logger.warning(message)
-    if exception_type == 'error':
-        raise RuntimeError(message)
-    else:  # warning
-        raise RuntimeWarning(message)
+    return handler(message, exception_type, logger)
@@ -0,0 +1,13 @@
+"""Helper functions for parsing HTTP headers"""
+
+from functools import lru_cache
+
+
+@lru_cache(maxsize=256)
+def media_type(content_type: str) -> str:
+    """
+    Returns the media type of a Content-Type header, without parameters such as the charset.
+    Media types are case-insensitive, so they are lowercased, e.g. 'application/json' for
+    'Application/JSON; charset=utf-8'. The few distinct headers a client sees are cached.
+    """
+    return content_type.split(';', 1)[0].strip().lower()
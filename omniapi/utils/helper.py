@@ -1,11 +1,17 @@
 import datetime
 import json
 import logging
+from itertools import product
 from pathlib import Path
 from typing import Union, Sequence, Optional
 
 import aiofiles
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional dependency, fall back to the json module
+    orjson = None
+
 from omniapi.utils.config import APIConfig
 from omniapi.utils.exception import raise_exception
 
@@ -37,37 +43,56 @@ def get_wait_time(config: APIConfig,
         logger (Logger): Logger for logging errors if logging exceptions
 
     Returns:
-        (float): Maximum wait time in seconds
+        (float): Maximum wait time in seconds. 0 if either sequence is empty and the error is not raised.
     """
-    max_requests_per_interval = config.max_requests_per_interval
-    interval_unit = config.interval_unit
     error_strategy = config.error_strategy
 
-    if isinstance(max_requests_per_interval, Sequence) and len(max_requests_per_interval) == 0:
+    # Check the types once, then handle scalars as sequences of length 1
+    requests_is_sequence = isinstance(config.max_requests_per_interval, Sequence)
+    units_is_sequence = isinstance(config.interval_unit, Sequence)
+    max_requests_per_interval = config.max_requests_per_interval if requests_is_sequence \
+        else (config.max_requests_per_interval,)
+    interval_unit = config.interval_unit if units_is_sequence else (config.interval_unit,)
+
+    if len(max_requests_per_interval) == 0:
         raise_exception("Length of max_requests_per_interval must not be 0", error_strategy, logger=logger)
-    if isinstance(interval_unit, Sequence) and len(interval_unit) == 0:
+    if len(interval_unit) == 0:
         raise_exception("Length of interval_unit must not be 0", error_strategy, logger=logger)
+    if len(max_requests_per_interval) == 0 or len(interval_unit) == 0:
+        return 0  # the error was logged or ignored, there is no limit to wait for
 
-    if isinstance(max_requests_per_interval, Sequence) and isinstance(interval_unit, Sequence):
+    if requests_is_sequence and units_is_sequence:
         if len(max_requests_per_interval) != len(interval_unit):
             raise_exception(f"Length Mismatch: Length of max_requests_per_interval ({len(max_requests_per_interval)})"
                             f" != interval_unit ({len(interval_unit)})", error_strategy, logger=logger)
-        return max(get_single_wait_time(max_request, unit) for max_request, unit in
-                   zip(max_requests_per_interval, interval_unit))
-    if isinstance(max_requests_per_interval, Sequence):
-        return max(get_single_wait_time(max_request, interval_unit) for max_request in max_requests_per_interval)
-    if isinstance(interval_unit, Sequence):
-        return max(get_single_wait_time(max_requests_per_interval, unit) for unit in interval_unit)
-    return get_single_wait_time(max_requests_per_interval, interval_unit)
+        pairs = zip(max_requests_per_interval, interval_unit)
+    else:  # at most one of them has more than one element
+        pairs = product(max_requests_per_interval, interval_unit)
+    return max(get_single_wait_time(max_request, unit) for max_request, unit in pairs)
 
 
-async def write_json(path: Path, data):
+async def write_json(path: Path, data, overwrite: bool = True):
     """
-    Asynchronously writes JSON data to a file.
+    Asynchronously writes JSON data to a file. Uses orjson for encoding if it is installed,
+    and falls back to the json module for data orjson cannot encode.
 
     Args:
         path (Path): The path of the file where the JSON data should be written.
         data (Any): The data to be written in JSON format.
+        overwrite (bool): Whether an existing file should be overwritten. Defaults to True.
+
+    Raises:
+        FileExistsError: If `overwrite` is False and the file already exists.
+        TypeError: If the data cannot be encoded as JSON. The file is not modified in that case.
     """
-    async with aiofiles.open(path, mode='w') as f:
-        await f.write(json.dumps(data))
+    # encoded before the file is opened, so that an existing file is left intact if the data cannot be encoded
+    content = None
+    if orjson is not None:
+        try:
+            content = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        except TypeError:  # e.g. integers wider than 64 bits, which the json module encodes
+            pass
+    if content is None:
+        content = json.dumps(data).encode('utf-8')
+    async with aiofiles.open(path, mode='wb' if overwrite else 'xb') as f:
+        await f.write(content)
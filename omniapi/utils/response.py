@@ -1,7 +1,8 @@
 import logging
 from enum import auto, Enum
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Union, Callable
+from typing import Optional, Union, Callable, List
 from aiohttp import ClientResponse
 
 from omniapi.utils.config import APIConfig
@@ -9,6 +10,12 @@ from omniapi.utils.download import download_file_to_path
 from omniapi.utils.state import ClientState
 
 
+@lru_cache(maxsize=1024)
+def _split_path(path: str, sep: str) -> tuple:
+    """Splits a path into its keys. Results are cached as the same paths are used for every page."""
+    return tuple(path.split(sep))
+
+
 class ResponseType(Enum):
     """
     Enum representing the type of the result that can be returned by a request.
@@ -29,23 +36,63 @@ class Response:
         state (ClientState): The state object for the client.
         logger (logging.Logger): Logger instance for recording events related to the Result.
 
+    Instances are reused through a free list. Use `acquire` and `release` instead of constructing
+    a new object per request; a released instance must not be used afterwards.
     """
 
+    __slots__ = ('response', 'config', 'state', 'logger')
+
+    _pool: List['Response'] = []
+    _max_pool_size = 256
+
     def __init__(self, response: ClientResponse, config: APIConfig, state: ClientState, logger: logging.Logger):
         self.response = response
         self.config = config
         self.state = state
         self.logger = logger
 
+    @classmethod
+    def acquire(cls, response: ClientResponse, config: APIConfig, state: ClientState, logger: logging.Logger):
+        """
+        Returns a Response from the free list, or constructs a new one if the free list is empty.
+
+        Args:
+            response (ClientResponse): The aiohttp response object.
+            config (APIConfig): The configuration object of the API.
+            state (ClientState): The state object for the client.
+            logger (logging.Logger): Logger of API Client.
+
+        Returns:
+            Response: The initialized Response object.
+        """
+        if not cls._pool:
+            return cls(response, config, state, logger)
+        result = cls._pool.pop()
+        result.response = response
+        result.config = config
+        result.state = state
+        result.logger = logger
+        return result
+
+    def release(self):
+        """Clears the references held by the Response and returns it to the free list."""
+        self.response = None
+        self.config = None
+        self.state = None
+        self.logger = None
+        if len(self._pool) < self._max_pool_size:
+            self._pool.append(self)
+
     def get_url(self):
         return str(self.response.url)
 
     async def json(self):
         """
-        Parses the response as a JSON.
+        Parses the response as a JSON. Decoded with the json module, which keeps integers of any size exact
+        and accepts NaN and Infinity.
 
         Returns:
-            (ResponseType.JSON, dict): A tuple of ResultType.JSON and the parsed JSON content.
+            (ResponseType.JSON, dict): A tuple of ResponseType.JSON and the parsed JSON content.
 
         """
         result = await self.response.json()
@@ -56,10 +103,10 @@ class Response:
         Parses the response as a text.
 
         Returns:
-            (ResponseType.TEXT, str): A tuple of ResultType.TEXT and the parsed text content.
+            (ResponseType.TEXT, str): A tuple of ResponseType.TEXT and the parsed text content.
 
         """
-        result = await self.response.json()
+        result = await self.response.text()
         return ResponseType.TEXT, result
 
     async def download(self, dir_path: Optional[Union[Path, str]] = None):
@@ -70,14 +117,15 @@ class Response:
             dir_path (Union[Path, str], optional): The directory path where the file should be downloaded.
 
         Returns:
-            (ResponseType.FILE, dict): A tuple of ResultType.FILE and a dictionary with the file details.
+            (ResponseType.FILE, dict): A tuple of ResponseType.FILE and a dictionary with the file details.
 
         """
         result = await download_file_to_path(
             self.response,
             self.config,
             dir_path,
-            self.logger
+            self.logger,
+            self.state
         )
         return ResponseType.FILE, result
 
@@ -92,7 +140,7 @@ class Response:
             settings (dict, optional): Additional settings for the request.
 
         Returns:
-            (ResponseType.REQUEST, tuple): A tuple of ResultType.REQUEST and a tuple with the request details.
+            (ResponseType.REQUEST, tuple): A tuple of ResponseType.REQUEST and a tuple with the request details.
 
         """
         return ResponseType.REQUEST, ("GET", url, params, settings)
@@ -108,7 +156,7 @@ class Response:
             settings (dict, optional): Additional settings for the request.
 
         Returns:
-            (ResponseType.REQUEST, tuple): A tuple of ResultType.REQUEST and a tuple with the request details.
+            (ResponseType.REQUEST, tuple): A tuple of ResponseType.REQUEST and a tuple with the request details.
 
         """
         return ResponseType.REQUEST, ("POST", url, data, settings)
@@ -128,7 +176,8 @@ class Response:
             sep (str): The separator for the paths.
 
         Returns:
-            tuple: A tuple with the method, url, and payload for the next request if there are more pages, None otherwise.
+            (ResponseType.REQUEST, tuple): A tuple of ResponseType.REQUEST and a tuple with the details of the
+                next request if there are more pages, None otherwise.
         """
         method = self.response.request_info.method
         start = self._get_paginate_elem(start_path, content, sep)
@@ -136,7 +185,7 @@ class Response:
         total = self._get_paginate_elem(total_path, content, sep)
 
         if start + per_page < total:
-            return ResultType.REQUEST, (method, url, payload_method(start + per_page))
+            return ResponseType.REQUEST, (method, url, payload_method(start + per_page), None)
 
     @staticmethod
     def _get_paginate_elem(path: str, content: dict, sep: str):
@@ -151,6 +200,6 @@ class Response:
         Returns:
             int: The pagination element.
         """
-        for key in path.split(sep):
+        for key in _split_path(path, sep):
             content = content[key]
         return int(content)
@@ -1,5 +1,6 @@
 import asyncio
-from dataclasses import dataclass
+from collections import deque
+from dataclasses import dataclass, field
 from typing import Optional
 
 import aiohttp_retry
@@ -19,9 +20,15 @@ class ClientState:
             Semaphores are used for limiting the number of simultaneous requests for each API key.
         last_request_time (dict): A dictionary keeping track of the last request time for each API key.
         wait_time (float): The amount of time to wait between requests.
+        known_directories (set): Download directories that are known to exist, so they are only created once.
+        write_buffers (deque): Free buffers for writing downloaded files, reused across downloads (at most 16 are kept).
+        hash_buffers (deque): Free buffers for hashing downloaded files, reused across downloads (at most 16 are kept).
     """
     client: aiohttp_retry.RetryClient
     api_keys_queue: Optional[asyncio.Queue]
     semaphores: dict
     last_request_time: dict
     wait_time: float
+    known_directories: set = field(default_factory=set)
+    write_buffers: deque = field(default_factory=deque)
+    hash_buffers: deque = field(default_factory=deque)
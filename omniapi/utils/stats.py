@@ -1,11 +1,41 @@
+import sys
 import time
-from collections import Counter
 from dataclasses import dataclass, field
+from operator import itemgetter
+from typing import TYPE_CHECKING
 
-from aiohttp.client import ClientResponse
+from omniapi.utils.headers import media_type
 
+if TYPE_CHECKING:  # only used in annotations, so importing the stats does not import the aiohttp client
+    from aiohttp.client import ClientResponse
 
-@dataclass
+
+# slots=True is only supported by dataclasses from Python 3.10 on
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+_STATUS_CLASS_FIELDS = {2: 'successful_requests', 3: 'redirects', 4: 'client_errors', 5: 'server_errors'}
+_SPECIAL_STATUS_FIELDS = {408: 'timeouts', 401: 'authentication_failure', 429: 'rate_limit_exceeded'}
+_ERROR_FIELDS = {'client_errors', 'server_errors', 'network_errors', 'timeouts'}
+
+
+def _status_buckets(code: int) -> tuple:
+    """Returns the class counter, the special counter, and the number of errors of a status code."""
+    class_field = _STATUS_CLASS_FIELDS.get(code // 100)
+    special_field = _SPECIAL_STATUS_FIELDS.get(code)
+    return class_field, special_field, (class_field in _ERROR_FIELDS) + (special_field in _ERROR_FIELDS)
+
+
+# Counters incremented by each status code
+_STATUS_BUCKETS = {code: _status_buckets(code) for code in range(100, 600)}
+_NO_BUCKETS = (None, None, 0)
+
+
+def _most_common(counts: dict) -> dict:
+    """Returns a copy of the counts, ordered from the most common to the least common key."""
+    return dict(sorted(counts.items(), key=itemgetter(1), reverse=True))
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class ClientStats:
     """
     ClientStats is a dataclass that provides various statistics for a client such as
@@ -21,11 +51,17 @@ class ClientStats:
         timeouts (int): The total number of timeouts occurred.
         authentication_failure (int): The total number of authentication failures.
         rate_limit_exceeded (int): The total number of times the rate limit was exceeded.
-        start_time (float): The start time of the client.
-        content_types (Counter): The count of responses by content type.
-        endpoint_count (Counter): The count of requests by endpoint.
-        status_codes (Counter): The count of responses by HTTP status code.
-        method_count (Counter): The count of requests by HTTP method.
+        total_errors (int): The sum of the client errors, server errors, network errors, and timeouts.
+            It is kept up to date as the counters are incremented, instead of being summed when read.
+        start_time (int): The reading of the monotonic clock, in nanoseconds, when the client started.
+        content_types (dict): The count of responses by media type, e.g. 'application/json' for
+            'application/json; charset=utf-8'.
+        endpoint_count (dict): The count of requests by endpoint.
+        status_codes (dict): The count of responses by HTTP status code.
+        method_count (dict): The count of requests by HTTP method.
+
+    The counts are kept in plain dicts rather than Counters, as they are updated for every request,
+    and the instances use slots so that updating the counters does not go through an instance dict.
     """
 
     total_requests: int = 0
@@ -40,68 +76,68 @@ class ClientStats:
     authentication_failure: int = 0
     rate_limit_exceeded: int = 0
 
-    start_time: float = time.time()
+    total_errors: int = 0
+
+    start_time: int = field(default_factory=time.monotonic_ns)
 
-    content_types: Counter = field(default_factory=Counter)
-    endpoint_count: Counter = field(default_factory=Counter)
-    status_codes: Counter = field(default_factory=Counter)
-    method_count: Counter = field(default_factory=Counter)
+    content_types: dict = field(default_factory=dict)
+    endpoint_count: dict = field(default_factory=dict)
+    status_codes: dict = field(default_factory=dict)
+    method_count: dict = field(default_factory=dict)
 
     def add_request(self, netloc: str, method: str):
         """Increment the total number of requests and update method and endpoint count."""
         self.total_requests += 1
-        self.method_count.update([method])
-        self.endpoint_count.update([netloc])
+        method_count = self.method_count
+        method_count[method] = method_count.get(method, 0) + 1
+        endpoint_count = self.endpoint_count
+        endpoint_count[netloc] = endpoint_count.get(netloc, 0) + 1
 
-    def add_response(self, response: ClientResponse):
+    def add_response(self, response: 'ClientResponse'):
         """Add a response to the statistics."""
         self.add_status_code(response.status)
 
-        if 'Content-Type' in response.headers:
-            self.content_types.update([response.headers['Content-Type']])
+        # a single lookup, as each lookup in the case-insensitive headers folds the case of the key
+        if content_type := response.headers.get('Content-Type'):
+            content_type = media_type(content_type)
+            content_types = self.content_types
+            content_types[content_type] = content_types.get(content_type, 0) + 1
 
     def add_status_code(self, status_code: int):
         """Add a status code to the statistics."""
-        self.status_codes.update([status_code])
-        if (status_type := status_code // 100) == 2:
-            self.successful_requests += 1
-        elif status_type == 3:
-            self.redirects += 1
-        elif status_type == 4:
-            self.client_errors += 1
-        elif status_type == 5:
-            self.server_errors += 1
-        if status_code == 408:
-            self.timeouts += 1
-        elif status_code == 401:
-            self.authentication_failure += 1
-        elif status_code == 429:
-            self.rate_limit_exceeded += 1
+        status_codes = self.status_codes
+        status_codes[status_code] = status_codes.get(status_code, 0) + 1
+        class_field, special_field, errors = _STATUS_BUCKETS.get(status_code, _NO_BUCKETS)
+        if class_field is not None:
+            setattr(self, class_field, getattr(self, class_field) + 1)
+        if special_field is not None:
+            setattr(self, special_field, getattr(self, special_field) + 1)
+        self.total_errors += errors
 
     def add_network_error(self):
         """Increment the total number of network errors."""
         self.network_errors += 1
+        self.total_errors += 1
 
-    @property
-    def total_errors(self):
-        """Calculate and return the total number of errors."""
-        return self.client_errors + self.server_errors + self.network_errors + self.timeouts
+    def add_timeout(self):
+        """Increment the total number of timeouts."""
+        self.timeouts += 1
+        self.total_errors += 1
 
     @property
     def error_rate(self):
-        """Calculate and return the error rate."""
-        return self.total_errors / self.total_requests
+        """Calculate and return the error rate. The error rate is 0 if no requests were made."""
+        return self.total_errors / (self.total_requests or 1)
 
     @property
     def total_time(self):
-        """Calculate and return the total time elapsed since the client started."""
-        return time.time() - self.start_time
+        """Calculate and return the total time in seconds elapsed since the client started."""
+        return (time.monotonic_ns() - self.start_time) * 1e-9
 
     def get_stats(self):
         """Return a dictionary containing all the stats."""
-        average_request_rate = self.total_time / self.total_requests
         return {'Total Requests': self.total_requests,
-                'Average Request Rate': average_request_rate,
+                'Average Request Rate': self.total_time / (self.total_requests or 1),
                 'Successful Requests': self.successful_requests,
                 'Total Errors': self.total_errors,
                 'Redirect Counts': self.redirects,
@@ -110,8 +146,8 @@ class ClientStats:
                 'Network Errors': self.network_errors,
                 'Timeout Counts': self.timeouts,
                 'Error Rates': self.error_rate,
-                'Endpoint Count': self.endpoint_count,
-                'Content Types': self.content_types,
-                'Status Codes': self.status_codes,
-                'Request Methods': self.method_count
+                'Endpoint Count': _most_common(self.endpoint_count),
+                'Content Types': _most_common(self.content_types),
+                'Status Codes': _most_common(self.status_codes),
+                'Request Methods': _most_common(self.method_count)
                 }
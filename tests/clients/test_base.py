@@ -0,0 +1,132 @@
+import asyncio
+import time
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from omniapi import APIClient, Response
+from omniapi.utils.response import ResponseType
+
+
+async def handle_item(request):
+    await asyncio.sleep(float(request.query.get('delay', 0)))
+    return web.json_response({'id': int(request.match_info['i'])})
+
+
+def make_app():
+    app = web.Application()
+    app.router.add_get('/items/{i}', handle_item)
+    return app
+
+
+@pytest_asyncio.fixture
+async def server():
+    async with TestServer(make_app()) as test_server:
+        yield test_server
+
+
+@pytest_asyncio.fixture
+async def other_server():
+    async with TestServer(make_app()) as test_server:
+        yield test_server
+
+
+class ChainClient(APIClient):
+    """Requests the next item until the last one is reached."""
+
+    def __init__(self, last: int, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.last = last
+        self.seen = []
+
+    async def request_callback(self, response: Response, setup_info):
+        _, content = await response.json()
+        self.seen.append(content['id'])
+        if content['id'] < self.last:
+            yield response.get(f"/items/{content['id'] + 1}")
+
+
+class FailingClient(APIClient):
+    async def request_callback(self, response: Response, setup_info):
+        raise ValueError("callback failed")
+        yield
+
+
+class MalformedRequestClient(APIClient):
+    """Yields a malformed request, so the callback is abandoned before it finishes."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.response_on_close = None
+
+    async def request_callback(self, response: Response, setup_info):
+        try:
+            yield ResponseType.REQUEST, ('GET',)
+        finally:
+            self.response_on_close = response.response
+
+
+@pytest.mark.asyncio
+async def test_execute_requests_concurrently(server):
+    urls = [str(server.make_url(f'/items/{i}?delay=0.2')) for i in range(10)]
+    async with ChainClient(last=0, max_requests_per_interval=0) as client:
+        start = time.monotonic()
+        await client.get(urls)
+        elapsed = time.monotonic() - start
+    assert sorted(client.seen) == list(range(10))
+    assert elapsed < 1.0
+
+
+@pytest.mark.asyncio
+async def test_execute_requests_max_workers(server):
+    urls = [str(server.make_url(f'/items/{i}?delay=0.1')) for i in range(4)]
+    async with ChainClient(last=0, max_requests_per_interval=0, max_workers=1) as client:
+        start = time.monotonic()
+        await client.get(urls)
+        elapsed = time.monotonic() - start
+    assert sorted(client.seen) == list(range(4))
+    assert elapsed >= 0.4
+
+
+@pytest.mark.asyncio
+async def test_execute_requests_throttled_endpoint(server, other_server):
+    urls = [str(server.make_url(f'/items/{i}')) for i in range(6)] + [str(other_server.make_url('/items/100'))]
+    async with ChainClient(last=0, max_requests_per_interval=0, max_workers=1) as client:
+        client.add_settings(str(server.make_url('/')), max_requests_per_interval=5)
+        await client.get(urls)
+    assert sorted(client.seen) == [0, 1, 2, 3, 4, 5, 100]
+    # the throttled endpoint does not hold up the request to the other endpoint
+    assert client.seen.index(100) <= 1
+
+
+@pytest.mark.asyncio
+async def test_execute_requests_chained(server):
+    async with ChainClient(last=5, max_requests_per_interval=0) as client:
+        await client.get(str(server.make_url('/items/0')))
+    assert client.seen == [0, 1, 2, 3, 4, 5]
+
+
+@pytest.mark.asyncio
+async def test_execute_requests_raises_worker_exception(server):
+    async with FailingClient(max_requests_per_interval=0) as client:
+        with pytest.raises(ValueError, match="callback failed"):
+            await client.get(str(server.make_url('/items/0')))
+
+
+@pytest.mark.asyncio
+async def test_stats_kept_after_close(server):
+    async with ChainClient(last=2, max_requests_per_interval=0) as client:
+        await client.get(str(server.make_url('/items/0')))
+    stats = client.stats.get_stats()
+    assert stats['Total Requests'] == 3
+    assert stats['Successful Requests'] == 3
+
+
+@pytest.mark.asyncio
+async def test_request_callback_closed_before_release(server):
+    async with MalformedRequestClient(max_requests_per_interval=0) as client:
+        with pytest.raises(ValueError):
+            await client.get(str(server.make_url('/items/0')))
+    assert client.response_on_close is not None
@@ -1,11 +1,193 @@
+import asyncio
+import errno
+import hashlib
+import multiprocessing
+import os
+import threading
+from collections import deque
+from types import SimpleNamespace
+
+import pytest
+from yarl import URL
+
 from omniapi.utils.config import FileNameStrategy
-from omniapi.utils.download import get_file_name
+from omniapi.utils.download import _MAX_BUFFER_POOL_SIZE, _MAX_WRITER_THREADS, download_file, get_file_name, get_file_extension, get_file_path
 
 
 def test_get_file_name():
     url = 'http://example.com/myfile.png'
 
-    assert len(get_file_name(url, FileNameStrategy.UNIQUE_ID)) == 36
+    assert len(get_file_name(url, FileNameStrategy.UNIQUE_ID)) == 32
     assert len(get_file_name(url, FileNameStrategy.URL_HASH_MD5)) == 32
     assert len(get_file_name(url, FileNameStrategy.URL_HASH_SHA1)) == 40
+    assert get_file_name(url, FileNameStrategy.URL_HASH_MD5) == hashlib.md5(url.encode()).hexdigest()
+    assert (get_file_name('http://example.com/a%20b', FileNameStrategy.URL_HASH_MD5)
+            != get_file_name('http://example.com/a b', FileNameStrategy.URL_HASH_MD5))
     assert get_file_name(url, FileNameStrategy.FILE_NAME) == 'myfile.png'
+    assert get_file_name(URL(url), FileNameStrategy.FILE_NAME) == 'myfile.png'
+    with pytest.raises(ValueError):
+        get_file_name(url, 'unknown')
+
+
+def test_get_file_name_xxh3():
+    pytest.importorskip('xxhash')
+    url = 'http://example.com/myfile.png'
+
+    assert len(get_file_name(url, FileNameStrategy.URL_HASH_XXH3)) == 32
+    assert get_file_name(url, FileNameStrategy.URL_HASH_XXH3) == get_file_name(url, FileNameStrategy.URL_HASH_XXH3)
+
+
+def test_get_file_extension():
+    response = SimpleNamespace(headers={'Content-Type': 'image/png'}, url=URL('http://example.com/file'))
+    assert get_file_extension(response, 'ignore') == '.png'
+
+    response = SimpleNamespace(headers={'Content-Type': 'application/json; charset=utf-8'},
+                               url=URL('http://example.com/file'))
+    assert get_file_extension(response, 'ignore') == '.json'
+
+    response = SimpleNamespace(headers={'Content-Type': 'Image/JPEG'}, url=URL('http://example.com/file'))
+    assert get_file_extension(response, 'ignore') == '.jpg'
+
+    response = SimpleNamespace(headers={}, url=URL('http://example.com/dir/archive.tar.gz?page=1'))
+    assert get_file_extension(response, 'ignore') == '.gz'
+
+    response = SimpleNamespace(headers={}, url=URL('http://example.com/dir/file'))
+    assert get_file_extension(response, 'ignore') is None
+
+    response = SimpleNamespace(headers={}, url=URL('http://example.com/dir.d/.hidden'))
+    assert get_file_extension(response, 'ignore') is None
+
+    for path in ('/file.', '/b..'):
+        response = SimpleNamespace(headers={}, url=URL(f'http://example.com{path}'))
+        assert get_file_extension(response, 'ignore') is None
+
+
+def test_get_file_path(tmp_path):
+    config = SimpleNamespace(files_download_directory=tmp_path / 'files',
+                             file_name_mode=FileNameStrategy.FILE_NAME,
+                             error_strategy='ignore')
+    response = SimpleNamespace(headers={'Content-Type': 'image/png'}, url=URL('http://example.com/image.jpeg'))
+    assert get_file_path(response, config) == os.path.join(tmp_path, 'files', 'image.png')
+    assert (tmp_path / 'files').is_dir()
+
+    response = SimpleNamespace(headers={}, url=URL('http://example.com/file'))
+    assert get_file_path(response, config) == os.path.join(tmp_path, 'files', 'file')
+
+
+class MockStreamReader:
+    def __init__(self, data: bytes, chunk_size: int = 5000):
+        self.chunks = [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
+
+    async def readany(self):
+        return self.chunks.pop(0) if self.chunks else b''
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('checksum_strategy', ['streaming', 'post_hoc'])
+@pytest.mark.parametrize('checksum_algorithm', ['md5', 'sha256'])
+async def test_download_file(tmp_path, checksum_strategy, checksum_algorithm):
+    data = os.urandom(300000)
+    response = SimpleNamespace(content=MockStreamReader(data))
+    path = tmp_path / 'file.bin'
+
+    checksum = await download_file(response, path, checksum_strategy=checksum_strategy,
+                                   checksum_algorithm=checksum_algorithm)
+    assert path.read_bytes() == data
+    assert checksum == hashlib.new(checksum_algorithm, data).hexdigest()
+
+
+@pytest.mark.asyncio
+async def test_download_file_reuses_buffers(tmp_path):
+    state = SimpleNamespace(write_buffers=deque(), hash_buffers=deque())
+    for i in range(2):
+        data = os.urandom(300000)
+        response = SimpleNamespace(content=MockStreamReader(data))
+        path = tmp_path / f'file{i}.bin'
+        checksum = await download_file(response, path, checksum_strategy='streaming', state=state)
+        assert path.read_bytes() == data
+        assert checksum == hashlib.md5(data).hexdigest()
+        assert len(state.write_buffers) == 1
+        assert len(state.hash_buffers) == 1
+
+
+@pytest.mark.asyncio
+async def test_download_file_fsync(tmp_path):
+    data = os.urandom(300000)
+    response = SimpleNamespace(content=MockStreamReader(data))
+    path = tmp_path / 'file.bin'
+    checksum = await download_file(response, path, fsync=True)
+    assert path.read_bytes() == data
+    assert checksum == hashlib.md5(data).hexdigest()
+
+
+@pytest.mark.asyncio
+async def test_download_file_keyword_only_options(tmp_path):
+    response = SimpleNamespace(content=MockStreamReader(b'data'))
+    with pytest.raises(TypeError):
+        await download_file(response, tmp_path / 'file.bin', 4096)
+    assert not (tmp_path / 'file.bin').exists()
+
+
+@pytest.mark.asyncio
+async def test_download_file_shares_writer_threads(tmp_path):
+    data = os.urandom(3 * 1024 * 1024)
+    responses = [SimpleNamespace(content=MockStreamReader(data)) for _ in range(10)]
+    await asyncio.gather(*(download_file(response, tmp_path / f'{i}.bin')
+                           for i, response in enumerate(responses)))
+    writer_threads = [thread for thread in threading.enumerate() if thread.name == 'omniapi-file-writer']
+    assert len(writer_threads) <= _MAX_WRITER_THREADS
+    for i in range(10):
+        assert (tmp_path / f'{i}.bin').read_bytes() == data
+
+
+@pytest.mark.asyncio
+async def test_download_file_caps_buffer_pools(tmp_path):
+    state = SimpleNamespace(write_buffers=deque(), hash_buffers=deque())
+    data = os.urandom(300000)
+    responses = [SimpleNamespace(content=MockStreamReader(data)) for _ in range(2 * _MAX_BUFFER_POOL_SIZE)]
+    await asyncio.gather(*(download_file(response, tmp_path / f'{i}.bin', checksum_strategy='streaming', state=state)
+                           for i, response in enumerate(responses)))
+    assert len(state.write_buffers) == _MAX_BUFFER_POOL_SIZE
+    assert len(state.hash_buffers) == _MAX_BUFFER_POOL_SIZE
+
+
+@pytest.mark.asyncio
+async def test_download_file_survives_failed_close(tmp_path, monkeypatch):
+    close = os.close
+    failures = []
+
+    def failing_close(fd):
+        close(fd)
+        if not failures:
+            failures.append(fd)
+            raise OSError(errno.EIO, 'Input/output error')
+
+    monkeypatch.setattr(os, 'close', failing_close)
+    data = os.urandom(300000)
+    with pytest.raises(OSError):
+        await asyncio.wait_for(download_file(SimpleNamespace(content=MockStreamReader(data)),
+                                             tmp_path / 'failed.bin'), 10)
+    monkeypatch.setattr(os, 'close', close)
+
+    responses = [SimpleNamespace(content=MockStreamReader(data)) for _ in range(2 * _MAX_WRITER_THREADS)]
+    checksums = await asyncio.wait_for(asyncio.gather(*(download_file(response, tmp_path / f'{i}.bin')
+                                                        for i, response in enumerate(responses))), 10)
+    assert checksums == [hashlib.md5(data).hexdigest()] * len(responses)
+
+
+def _download_in_child(path):
+    data = b'data' * 1000
+    asyncio.run(download_file(SimpleNamespace(content=MockStreamReader(data)), path))
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="requires fork")
+async def test_download_file_after_fork(tmp_path):
+    await download_file(SimpleNamespace(content=MockStreamReader(b'data')), tmp_path / 'parent.bin')
+    child = multiprocessing.get_context('fork').Process(target=_download_in_child, args=(tmp_path / 'child.bin',))
+    child.start()
+    child.join(10)
+    if child.is_alive():
+        child.kill()
+    assert child.exitcode == 0
+    assert (tmp_path / 'child.bin').read_bytes() == b'data' * 1000
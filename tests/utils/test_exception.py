@@ -0,0 +1,24 @@
+import logging
+
+import pytest
+
+from omniapi.utils.exception import raise_exception
+
+
+def test_raise_exception(caplog):
+    assert raise_exception("message", 'ignore') is False
+
+    with pytest.raises(RuntimeError, match="message"):
+        raise_exception("message", 'raise')
+    with pytest.raises(RuntimeWarning, match="message"):
+        raise_exception("message", 'raise', exception_type='warning')
+
+    logger = logging.getLogger('test_raise_exception')
+    with caplog.at_level(logging.WARNING, logger='test_raise_exception'):
+        raise_exception("logged message", 'log', exception_type='warning', logger=logger)
+    assert "logged message" in caplog.text
+
+    with pytest.raises(RuntimeError):
+        raise_exception("message", 'unknown')
+    with pytest.raises(RuntimeError):
+        raise_exception("message", 'log', exception_type='unknown', logger=logger)
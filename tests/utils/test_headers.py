@@ -0,0 +1,6 @@
+from omniapi.utils.headers import media_type
+
+
+def test_media_type():
+    assert media_type('Application/JSON; charset=utf-8') == 'application/json'
+    assert media_type(' text/html ') == 'text/html'
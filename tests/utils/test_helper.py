@@ -5,6 +5,7 @@ from datetime import timedelta
 import json
 import os
 import asyncio
+import logging
 
 
 def test_get_single_wait_time():
@@ -32,6 +33,25 @@ def test_get_wait_time():
     assert get_wait_time(config) == 0
 
 
+def test_get_wait_time_empty(caplog):
+    config = APIConfig()
+    config.max_requests_per_interval = []
+    config.interval_unit = timedelta(minutes=1)
+    config.error_strategy = 'raise'
+    with pytest.raises(RuntimeError, match="max_requests_per_interval"):
+        get_wait_time(config)
+
+    logger = logging.getLogger('test_get_wait_time_empty')
+    config.error_strategy = 'log'
+    assert get_wait_time(config, logger) == 0
+    assert "max_requests_per_interval" in caplog.text
+
+    config.max_requests_per_interval = 2
+    config.interval_unit = []
+    config.error_strategy = 'ignore'
+    assert get_wait_time(config) == 0
+
+
 @pytest.mark.asyncio
 async def test_write_json():
     path = "./test.json"
@@ -40,4 +60,20 @@ async def test_write_json():
     assert os.path.exists(path)
     with open(path, 'r') as f:
         assert json.load(f) == data
+    with pytest.raises(FileExistsError):
+        await write_json(path, data, overwrite=False)
     os.remove(path)  # cleanup
+
+
+@pytest.mark.asyncio
+async def test_write_json_fallback(tmp_path):
+    path = tmp_path / "test.json"
+    data = {"id": 18446744073709551617}
+    await write_json(path, data)
+    with open(path, 'r') as f:
+        assert json.load(f) == data
+
+    with pytest.raises(TypeError):
+        await write_json(path, {"value": object()})
+    with open(path, 'r') as f:
+        assert json.load(f) == data
@@ -0,0 +1,60 @@
+import json
+
+import pytest
+from types import SimpleNamespace
+
+from omniapi.utils.response import Response, ResponseType
+
+
+class MockClientResponse:
+    def __init__(self, body: str, method: str = 'GET'):
+        self.body = body
+        self.request_info = SimpleNamespace(method=method)
+
+    async def text(self):
+        return self.body
+
+    async def json(self, loads=json.loads):
+        return loads(self.body)
+
+
+@pytest.mark.asyncio
+async def test_json():
+    response = Response(MockClientResponse('{"a": [1, 2]}'), None, None, None)
+    assert await response.json() == (ResponseType.JSON, {'a': [1, 2]})
+
+    response = Response(MockClientResponse('{"id": 18446744073709551617, "score": NaN}'), None, None, None)
+    _, content = await response.json()
+    assert content['id'] == 18446744073709551617
+    assert content['score'] != content['score']
+
+
+@pytest.mark.asyncio
+async def test_text():
+    response = Response(MockClientResponse('not json'), None, None, None)
+    assert await response.text() == (ResponseType.TEXT, 'not json')
+
+
+def test_pool():
+    first = MockClientResponse('first')
+    response = Response.acquire(first, None, None, None)
+    response.release()
+    assert response.response is None
+
+    second = MockClientResponse('second')
+    reused = Response.acquire(second, None, None, None)
+    assert reused is response
+    assert reused.response is second
+    reused.release()
+
+
+def test_paginate():
+    response = Response(MockClientResponse(''), None, None, None)
+    content = {'meta': {'start': 0, 'per_page': 10, 'total': 25}}
+    result = response.paginate('http://example.com/items', content, 'meta.start', 'meta.per_page',
+                               'meta.total', lambda start: {'start': start})
+    assert result == (ResponseType.REQUEST, ('GET', 'http://example.com/items', {'start': 10}, None))
+
+    content = {'meta': {'start': 20, 'per_page': 10, 'total': 25}}
+    assert response.paginate('http://example.com/items', content, 'meta.start', 'meta.per_page',
+                             'meta.total', lambda start: {'start': start}) is None
@@ -0,0 +1,65 @@
+import copy
+import time
+from dataclasses import asdict
+from types import SimpleNamespace
+
+from omniapi.utils.stats import ClientStats
+
+
+def test_client_stats():
+    stats = ClientStats()
+    for netloc, method in [('a.com', 'GET'), ('b.com', 'GET'), ('b.com', 'POST')]:
+        stats.add_request(netloc, method)
+    for status, content_type in [(200, 'application/json'), (404, 'Text/HTML; charset=utf-8'), (500, None), (429, None)]:
+        headers = {} if content_type is None else {'Content-Type': content_type}
+        stats.add_response(SimpleNamespace(status=status, headers=headers))
+    stats.add_network_error()
+    stats.add_status_code(408)
+    stats.add_timeout()
+
+    assert stats.total_requests == 3
+    assert stats.successful_requests == 1
+    assert stats.client_errors == 3
+    assert stats.server_errors == 1
+    assert stats.rate_limit_exceeded == 1
+    assert stats.timeouts == 2
+    assert stats.total_errors == stats.client_errors + stats.server_errors + stats.network_errors + stats.timeouts
+
+    result = stats.get_stats()
+    assert list(result['Endpoint Count'].items()) == [('b.com', 2), ('a.com', 1)]
+    assert list(result['Request Methods'].items()) == [('GET', 2), ('POST', 1)]
+    assert result['Status Codes'] == {200: 1, 404: 1, 500: 1, 429: 1, 408: 1}
+    assert result['Content Types'] == {'application/json': 1, 'text/html': 1}
+    assert result['Total Requests'] == 3
+    assert stats.get_stats() is not result
+
+
+def test_client_stats_start_time():
+    first = ClientStats()
+    time.sleep(0.01)
+    assert ClientStats().start_time > first.start_time
+
+
+def test_client_stats_without_requests():
+    stats = ClientStats()
+    assert stats.error_rate == 0
+    assert stats.get_stats()['Total Requests'] == 0
+
+
+def test_client_stats_counts_not_shared():
+    stats, other = ClientStats(), ClientStats()
+    stats.add_status_code(200)
+    assert stats.status_codes == {200: 1}
+    assert other.status_codes == {}
+
+    other.status_codes[404] = 1
+    assert copy.deepcopy(other).status_codes == {404: 1}
+    assert asdict(stats)['status_codes'] == {200: 1}
+
+
+def test_client_stats_init_fields():
+    stats = ClientStats(total_requests=3, client_errors=1, total_errors=1)
+    assert stats.total_requests == 3
+    assert stats.error_rate == 1 / 3
+    assert 'total_requests=3' in repr(stats)
+